@@ -5,12 +5,306 @@ Scans repository for tests, calculates coverage, and reports results.
 """
 
 import argparse
+import configparser
+import functools
 import os
 import sys
 import subprocess
-import glob
+import io
 import json
-from typing import List, Tuple
+import re
+import shutil
+import stat
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator, List, Tuple
+
+import coverage
+import pytest
+
+# orjson reads and writes the discovery cache in C when it is installed, json is the fallback.
+# Both loaders accept bytes, so the cache is always handled as UTF-8 bytes.
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:  # pragma: no cover
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+# Matches test_*.py, *_test.py and tests.py file names
+_TEST_RE = re.compile(r'^(?:test_[^/]*\.py|[^/]*_test\.py|tests\.py)$')
+
+# Splits comma-separated path lists, dropping the whitespace around each comma
+_SPLIT_RE = re.compile(r'\s*,\s*')
+
+# Directories that never hold the project's own tests, discovery does not descend into them
+_IGNORED_DIRS = frozenset({
+    '.git', '.hg', '.svn', '.tox', '.nox', '.venv', 'venv', '.eggs',
+    'node_modules', '__pycache__', '.mypy_cache', '.pytest_cache'
+})
+
+# Matches the characters that make a path segment a glob pattern
+_GLOB_MAGIC_RE = re.compile(r'[*?[]')
+
+# The directory of this script, it is kept off the tests' import path because it holds its own tests package
+_ACTION_DIR = os.path.dirname(os.path.abspath(__file__))
+# The plugin loaded into the pytest-xdist workers lives alone in its directory, so importing it shadows nothing
+_PLUGIN_DIR = os.path.join(_ACTION_DIR, '_plugins')
+_WORKER_PLUGIN = 'coverage_worker_plugin'
+
+
+def _translate_segment(segment: str) -> str:
+    """
+    Translate one glob path segment into a regular expression.
+
+    Unlike fnmatch.translate, wildcards never match a '/' and, as with glob, a wildcard at the
+    start of the segment does not match hidden names.
+
+    Args:
+        segment: str, the path segment to translate
+
+    Returns:
+        str: The regular expression source for the segment
+    """
+    parts = []
+    i = 0
+    while i < len(segment):
+        char = segment[i]
+        i += 1
+        if char == '*':
+            parts.append('[^/]*')
+        elif char == '?':
+            parts.append('[^/]')
+        elif char == '[':
+            end = segment.find(']', i + 1 if segment[i:i + 1] in ('!', ']') else i)
+            if end == -1:
+                parts.append(re.escape(char))
+                continue
+            body = segment[i:end].replace('\\', '\\\\')
+            # Like fnmatch, escape what re would read as a nested set or a set operation
+            body = re.sub(r'([\[&~|])', r'\\\1', body)
+            i = end + 1
+            if body.startswith('!'):
+                body = '^' + body[1:]
+            elif body.startswith('^'):
+                body = '\\' + body
+            parts.append(f'[{body}]')
+        else:
+            parts.append(re.escape(char))
+    
+    regex = ''.join(parts)
+    if segment[:1] in ('*', '?', '['):
+        regex = r'(?!\.)' + regex
+    return regex
+
+
+@functools.lru_cache(maxsize=None)
+def _translate_glob(pattern: str) -> str:
+    """
+    Translate a recursive glob pattern into a regular expression, once per pattern.
+
+    Args:
+        pattern: str, the glob pattern, relative to the search root
+
+    Returns:
+        str: The regular expression source matching root relative paths with '/' separators
+    """
+    segments = [segment for segment in pattern.split('/') if segment not in ('', '.')]
+    regex = ''
+    for i, segment in enumerate(segments):
+        last = i == len(segments) - 1
+        if segment == '**':
+            # Zero or more directories, or any file below them when it ends the pattern
+            regex += r'(?:(?!\.)[^/]+/)*' + (r'(?!\.)[^/]+' if last else '')
+        else:
+            regex += _translate_segment(segment) + ('' if last else '/')
+    return regex
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_globs(patterns: tuple[str, ...]) -> re.Pattern:
+    """
+    Compile recursive glob patterns into a single regular expression.
+
+    Args:
+        patterns: Tuple[str, ...], the glob patterns, relative to the search root
+
+    Returns:
+        re.Pattern: The expression matching root relative paths (with '/' separators) of any pattern
+    """
+    # Patterns shared between different combinations are only translated once
+    return re.compile('(?:' + '|'.join(map(_translate_glob, patterns)) + r')\Z')
+
+
+def _scan_files(
+    root: str,
+    start: str,
+    depth: int | None,
+    previous: dict[str, list] | None = None,
+    current: dict[str, list] | None = None
+) -> Iterator[str]:
+    """
+    Yield the files below a directory in a single os.scandir pass.
+
+    Args:
+        root: str, the directory the yielded paths are relative to
+        start: str, the root relative directory to scan, empty for the root itself
+        depth: int, how many directory levels below the start to descend, None for no limit
+        previous: Dict[str, list], the directory listings of the last run, reused while a directory is unchanged
+        current: Dict[str, list], receives the listing of every directory visited in this run
+
+    Returns:
+        Iterator[str]: The root relative paths, with '/' separators, of the files found
+    """
+    pending = [(start, 0)]
+    while pending:
+        directory, level = pending.pop()
+        path = os.path.join(root, directory) if directory else root
+        mtime = None
+        if current is not None:
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+        
+        # A directory's mtime changes whenever an entry is added, removed or renamed in it
+        listing = (previous or {}).get(path)
+        if not listing or listing[0] != mtime:
+            try:
+                entries = os.scandir(path)
+            except OSError:
+                continue
+            listing = [mtime, [], []]
+            # DirEntry caches the file type from getdents, so classifying an entry costs no extra stat
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in _IGNORED_DIRS:
+                            listing[2].append(entry.name)
+                    elif entry.is_file():
+                        listing[1].append(entry.name)
+        if current is not None:
+            current[path] = listing
+        
+        prefix = f'{directory}/' if directory else ''
+        yield from (prefix + name for name in listing[1])
+        if depth is None or level < depth:
+            pending.extend((prefix + name, level + 1) for name in listing[2])
+
+
+def _walk_tests(
+    full_path: str,
+    previous: dict[str, list] | None = None,
+    current: dict[str, list] | None = None
+) -> list[str]:
+    """
+    Find tests in a directory tree.
+
+    Args:
+        full_path: str, the path to the directory to search
+        previous: Dict[str, list], the directory listings of the last run, reused while a directory is unchanged
+        current: Dict[str, list], receives the listing of every directory visited in this run
+
+    Returns:
+        List[str]: List of test files found below the directory
+    """
+    return [
+        os.path.join(full_path, relative_path)
+        for relative_path in _scan_files(full_path, '', None, previous, current)
+        if _TEST_RE.match(relative_path.rpartition('/')[2])
+    ]
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_glob(patterns: tuple[str, ...], root: str) -> tuple[str, ...]:
+    """
+    Expand glob patterns once per process, in one traversal shared by all of them.
+
+    Args:
+        patterns: Tuple[str, ...], the recursive glob patterns to expand
+        root: str, the directory the relative patterns are relative to
+
+    Returns:
+        Tuple[str, ...]: The files matching any of the patterns
+    """
+    # Absolute patterns are expanded below their own anchor instead of the search root
+    roots: dict[str, list[str]] = {}
+    for pattern in patterns:
+        drive, path = os.path.splitdrive(pattern)
+        if os.path.isabs(pattern):
+            roots.setdefault(drive + os.sep, []).append(path.lstrip('/' + os.sep))
+        else:
+            roots.setdefault(root, []).append(pattern)
+    if list(roots) != [root]:
+        return tuple(
+            file_path for anchor, anchored in roots.items() for file_path in _cached_glob(tuple(anchored), anchor)
+        )
+    
+    regex = _compile_globs(patterns)
+    
+    # Only the directories below each pattern's literal prefix can match, at most as deep as the pattern
+    starts: dict[str, int | None] = {}
+    for pattern in patterns:
+        segments = [segment for segment in pattern.split('/') if segment not in ('', '.')]
+        literal = 0
+        while literal < len(segments) - 1 and not _GLOB_MAGIC_RE.search(segments[literal]):
+            literal += 1
+        start = '/'.join(segments[:literal])
+        depth = None if '**' in segments[literal:] else len(segments) - literal - 1
+        if start in starts:
+            depth = None if depth is None or starts[start] is None else max(depth, starts[start])
+        starts[start] = depth
+    
+    # A start below another start without a depth limit is already covered by it
+    walks = [
+        (start, depth) for start, depth in starts.items()
+        if not any(
+            other_depth is None and other != start and (not other or start.startswith(other + '/'))
+            for other, other_depth in starts.items()
+        )
+    ]
+    return tuple(
+        os.path.join(root, relative_path)
+        for start, depth in walks
+        for relative_path in _scan_files(root, start, depth)
+        if regex.match(relative_path)
+    )
+
+
+def _config_value(value) -> str:
+    """
+    Format a coverage.py setting the way a .coveragerc file spells it.
+
+    Args:
+        value: bool, int, float, str or List[str], the setting as coverage.py holds it
+
+    Returns:
+        str: The setting, with list items on separate lines
+    """
+    if isinstance(value, (list, tuple)):
+        return '\n'.join(map(str, value))
+    return str(value)
+
+
+def _extend_config_list(section: configparser.SectionProxy, option: str, item: str) -> None:
+    """
+    Add an item to a list setting of a .coveragerc section, keeping the items already there.
+
+    Args:
+        section: configparser.SectionProxy, the section holding the setting
+        option: str, the name of the list setting
+        item: str, the item to add
+
+    Returns:
+        None
+    """
+    items = section.get(option, '').split()
+    if item not in items:
+        section[option] = '\n'.join(items + [item])
 
 
 class CoverageChecker:
@@ -27,81 +321,182 @@ class CoverageChecker:
             None
         """
         self.minimum_coverage = float(args.minimum_coverage)
-        self.test_paths = [p.strip() for p in args.test_paths.split(',') if p.strip()]
-        self.source_paths = [p.strip() for p in args.source_paths.split(',') if p.strip()]
-        self.exclude_paths = [p.strip() for p in args.exclude_paths.split(',') if p.strip()]
+        self.test_paths = [p for p in _SPLIT_RE.split(args.test_paths.strip()) if p]
+        self.source_paths = [p for p in _SPLIT_RE.split(args.source_paths.strip()) if p]
+        self.exclude_paths = [p for p in _SPLIT_RE.split(args.exclude_paths.strip()) if p]
         self.fail_on_low_coverage = args.fail_on_low_coverage.lower() == 'true'
         self.report_format = args.report_format
+        self.track_subprocesses = getattr(args, 'track_subprocesses', 'false').lower() == 'true'
+        self.discovery_cache = getattr(args, 'discovery_cache', '').strip()
+        self.quiet = getattr(args, 'quiet', 'false').lower() == 'true'
+        self.use_subprocess = getattr(args, 'subprocess', 'false').lower() == 'true'
         self.workspace_path = os.getcwd()
+        self._ws_prefix = os.path.join(os.path.normpath(self.workspace_path), '')
+        
+        # Resolve the coverage executable once so spawning it skips the PATH search
+        self._coverage_bin = shutil.which('coverage') or 'coverage'
         
-    def find_test_files(self) -> list[str]:
+        # coverage.py keeps only the last --source/--omit flag, so every path goes into one comma-separated value
+        self._source_args = (f"--source={','.join(self.source_paths)}",) if self.source_paths else ()
+        self._omit_args = (f"--omit={','.join(self.exclude_paths)}",) if self.exclude_paths else ()
+        
+    def find_test_files(self, root: str | None = None) -> list[str]:
         """
         Discover test files in the repository.
 
         Args:
-            None
+            root: str, the directory the test paths are relative to, defaults to the workspace
 
         Returns:
             List[str]: List of test files found in the repository
         """
-        test_files = []
+        root = root or self.workspace_path
+        test_files: set[str] = set()
+        directories = []
+        patterns = []
         
         print("Discovering test files...")
         
         for test_path in self.test_paths:
             # Handle glob patterns
             if '*' in test_path:
-                matches = glob.glob(test_path, recursive=True)
-                test_files.extend(matches)
+                patterns.append(test_path)
             else:
-                self._handle_file_paths(test_path, test_files)
+                self._handle_file_paths(test_path, test_files, directories, root)
+        
+        # Directory listings from the last run are reused for directories that have not changed since
+        previous = self._load_discovery_cache(root) if self.discovery_cache else None
+        current = {} if self.discovery_cache else None
+        
+        # Walk every directory concurrently with the glob expansion, the work is bound by filesystem latency.
+        # All patterns share one traversal instead of each glob walking the same directories again.
+        if directories or patterns:
+            with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+                futures = [executor.submit(_walk_tests, directory, previous, current) for directory in directories]
+                if patterns:
+                    futures.append(executor.submit(_cached_glob, tuple(patterns), root))
+                for future in as_completed(futures):
+                    test_files.update(future.result())
+        
+        if current is not None:
+            self._save_discovery_cache(current, root)
         
-        # Remove duplicates and non-existent files
-        test_files = list(set([f for f in test_files if os.path.isfile(f)]))
+        # Every source only yields existing files and the set already removed duplicates
+        sorted_files = sorted(test_files)
         
-        # Convert to relative paths for display
-        relative_paths = [os.path.relpath(f, self.workspace_path).replace(os.sep, '/') for f in test_files]
+        if self.quiet:
+            print(f"Found {len(sorted_files)} test files")
+            return sorted_files
         
-        print(f"Found {len(test_files)} test files:")
-        for relative_path in relative_paths:
-            print(f"   • {relative_path}")
+        # Write the whole listing at once (relative paths for display) instead of one print per file
+        lines = [f"Found {len(sorted_files)} test files:"]
+        lines.extend(f"   • {self._rel(f, root)}" for f in sorted_files)
+        sys.stdout.write('\n'.join(lines) + '\n')
             
-        return test_files
+        return sorted_files
     
-    def _handle_file_paths(self, test_path: str, test_files: list[str]) -> None:
+    def _rel(self, path: str, root: str | None = None) -> str:
         """
-        Handle file paths for test discovery.
+        Convert a path to a workspace relative path with forward slashes for display.
 
         Args:
-            test_path: str, the path to the test file or directory
-            test_files: List[str], the list of test files found so far
+            path: str, the path to convert
+            root: str, the directory to make the path relative to, defaults to the workspace
 
         Returns:
-            None
+            str: The workspace relative path
+        """
+        if root is None or root == self.workspace_path:
+            root, prefix = self.workspace_path, self._ws_prefix
+        else:
+            prefix = os.path.join(os.path.normpath(root), '')
+        # Paths found below the root only need their prefix cut off, relpath is the fallback
+        if path.startswith(prefix):
+            return path[len(prefix):].replace(os.sep, '/')
+        return os.path.relpath(path, root).replace(os.sep, '/')
+    
+    def _discovery_cache_path(self, root: str) -> str:
+        """
+        Resolve the discovery cache file against the discovery root.
+
+        Args:
+            root: str, the directory test discovery runs in
+
+        Returns:
+            str: The absolute path to the discovery cache file
+        """
+        return os.path.join(root, self.discovery_cache)
+    
+    def _load_discovery_cache(self, root: str) -> dict[str, list]:
+        """
+        Load the directory listings saved by the previous run.
+
+        Args:
+            root: str, the directory test discovery runs in
+
+        Returns:
+            Dict[str, list]: The cached listings keyed by directory, empty if there is no usable cache
+        """
+        try:
+            with open(self._discovery_cache_path(root), 'rb') as f:
+                cache = _loads(f.read())
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(cache, dict):
+            return {}
+        # The file may be restored from anywhere, a malformed listing only means its directory is scanned again
+        return {
+            directory: listing for directory, listing in cache.items()
+            if isinstance(listing, list) and len(listing) == 3 and isinstance(listing[0], int)
+            and all(
+                isinstance(names, list) and all(isinstance(name, str) for name in names)
+                for names in listing[1:]
+            )
+        }
+    
+    def _save_discovery_cache(self, cache: dict[str, list], root: str) -> None:
         """
-        full_path = os.path.join(self.workspace_path, test_path)
-        if os.path.isdir(full_path):
-            self._find_tests_in_dir(full_path, test_files)
-        elif os.path.isfile(full_path) and full_path.endswith('.py'):
-            test_files.append(full_path)
+        Save the directory listings of this run for the next one.
 
-    def _find_tests_in_dir(self, full_path: str, test_files: list[str]) -> None:
+        Args:
+            cache: Dict[str, list], the listings keyed by directory
+            root: str, the directory test discovery runs in
+
+        Returns:
+            None
         """
-        Find tests in a directory.
+        cache_path = self._discovery_cache_path(root)
+        try:
+            # Write next to the target and rename so a cancelled run never leaves a truncated cache
+            with tempfile.NamedTemporaryFile('wb', dir=os.path.dirname(cache_path), delete=False) as f:
+                f.write(_dumps(cache))
+            os.replace(f.name, cache_path)
+        except OSError as e:
+            print(f"Warning: Could not save discovery cache: {e}")
+    
+    def _handle_file_paths(self, test_path: str, test_files: set[str], directories: list[str], root: str) -> None:
+        """
+        Handle file paths for test discovery.
 
         Args:
-            full_path: str, the path to the directory to search
-            test_files: List[str], the list of test files found so far
+            test_path: str, the path to the test file or directory
+            test_files: Set[str], the test files found so far
+            directories: List[str], the list of directories still to be searched
+            root: str, the directory the test path is relative to
 
         Returns:
             None
         """
-        for root, _, files in os.walk(full_path):
-            for file in files:
-                if (file.startswith('test_') and file.endswith('.py')) or \
-                    (file.endswith('_test.py')) or \
-                    (file == 'tests.py'):
-                    test_files.append(os.path.join(root, file))
+        full_path = os.path.join(root, test_path)
+        # One stat classifies the path, instead of an isdir followed by an isfile
+        try:
+            mode = os.stat(full_path).st_mode
+        except OSError:
+            return
+        if stat.S_ISDIR(mode):
+            directories.append(full_path)
+        elif stat.S_ISREG(mode) and full_path.endswith('.py'):
+            test_files.add(full_path)
     
     def build_coverage_command(self, test_files: list[str]) -> list[str]:
         """
@@ -113,31 +508,34 @@ class CoverageChecker:
         Returns:
             List[str]: The coverage command to run tests with coverage collection
         """
-        # Create source include pattern
-        source_include = []
-        for source_path in self.source_paths:
-            if source_path == '.':
-                source_include.append('--source=.')
-            else:
-                source_include.append(f'--source={source_path}')
-        
-        # Create exclude pattern - coverage.py expects comma-separated values for --omit
-        exclude_patterns = []
-        if self.exclude_paths:
-            omit_value = ','.join(self.exclude_paths)
-            exclude_patterns = [f'--omit={omit_value}']
-        
-        # Build the command
-        cmd = ['coverage', 'run'] + source_include + exclude_patterns
+        # Build the command - parallel mode gives every process its own data file for `coverage combine`
+        cmd = [self._coverage_bin, 'run', '--parallel-mode', *self._source_args, *self._omit_args]
         
         # Add pytest runner if test files found, otherwise use unittest discovery
         if test_files:
-            cmd.extend(['-m', 'pytest'] + test_files)
+            cmd.extend(['-m', 'pytest'] + self._pytest_args(test_files))
         else:
             cmd.extend(['-m', 'unittest', 'discover'])
             
         return cmd
     
+    def _pytest_args(self, test_files: list[str]) -> list[str]:
+        """
+        Build the pytest arguments that shard the test files across pytest-xdist workers.
+
+        Args:
+            test_files: List[str], the list of test files to run
+
+        Returns:
+            List[str]: The pytest arguments
+        """
+        # Shard whole test files across all available cores with pytest-xdist
+        args = ['-n', 'auto', '--dist=loadfile']
+        if not self.track_subprocesses:
+            # Only the workers keep the coverage startup hook, not the processes the tests spawn
+            args.extend(['-p', _WORKER_PLUGIN])
+        return args + test_files
+    
     def run_tests_with_coverage(self, test_files: list[str]) -> tuple[bool, str]:
         """
         Run tests with coverage collection.
@@ -146,36 +544,35 @@ class CoverageChecker:
             test_files: List[str], the list of test files to run
 
         Returns:
-            Tuple[bool, str]: A tuple containing a boolean indicating success and a string containing the test output
+            Tuple[bool, str]: A tuple containing a boolean indicating success and a string describing the test outcome
         """
         print("\nRunning tests with coverage...")
         
-        # Build and run coverage command
-        cmd = self.build_coverage_command(test_files)
-        print(f"Command: {' '.join(cmd)}")
-        
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                cwd=self.workspace_path
-            )
-            
-            print("Test output:")
-            print(result.stdout)
-            if result.stderr:
-                print("Errors:")
-                print(result.stderr)
+            with tempfile.TemporaryDirectory() as config_dir:
+                env = self._build_coverage_env(config_dir, test_files)
+                # Parallel data files left by an earlier run, such as a failed one, would be combined into this one
+                coverage.Coverage(
+                    data_file=os.path.join(self.workspace_path, '.coverage'),
+                    config_file=env['COVERAGE_RCFILE']
+                ).erase()
+                if self.use_subprocess:
+                    returncode = self._run_tests_in_subprocess(test_files, env)
+                else:
+                    returncode = self._run_tests_in_process(test_files, env)
             
             # Check if tests passed (return code 0 means success)
-            if result.returncode != 0:
-                print(f"Error: Tests failed with return code {result.returncode}")
-                return False, result.stdout + result.stderr
+            if returncode != 0:
+                print(f"Error: Tests failed with return code {returncode}")
+                return False, f"Tests failed with return code {returncode}"
                 
             print("Success: All tests passed!")
-            return True, result.stdout + result.stderr
+            self.combine_coverage_data()
+            return True, "All tests passed"
             
+        except coverage.CoverageException as e:
+            print(f"Error: Error running tests: {e}")
+            return False, f"Error running tests: {str(e)}"
         except subprocess.CalledProcessError as e:
             print(f"Error: Error running tests: {e}")
             return False, f"Error running tests: {str(e)}"
@@ -183,6 +580,175 @@ class CoverageChecker:
             print("Error: Coverage tool not found. Make sure 'coverage' is installed.")
             return False, "Coverage tool not found"
     
+    def _run_tests_in_process(self, test_files: list[str], env: dict[str, str]) -> int:
+        """
+        Run the tests with coverage inside this interpreter, skipping the startup of a coverage process.
+
+        Args:
+            test_files: List[str], the list of test files to run
+            env: Dict[str, str], the environment built for the coverage run
+
+        Returns:
+            int: The exit code of the test run
+        """
+        cov = coverage.Coverage(
+            data_file=os.path.join(self.workspace_path, '.coverage'),
+            data_suffix=True,
+            config_file=env['COVERAGE_RCFILE']
+        )
+        
+        # pytest-xdist workers inherit os.environ, so the startup hook settings have to be in place here
+        original_environ = os.environ.copy()
+        os.environ.clear()
+        os.environ.update(env)
+        # Match `coverage run -m`, which puts the working directory first on the import path.
+        # The workers copy this path, so they can import the worker plugin, but not the action's
+        # own tests package, which would shadow a tests namespace package of the project.
+        original_path = sys.path[:]
+        sys.path[:] = [self.workspace_path, _PLUGIN_DIR] + [
+            path for path in original_path if os.path.abspath(path) != _ACTION_DIR
+        ]
+        
+        print("Test output:")
+        sys.stdout.flush()
+        cov.start()
+        try:
+            if test_files:
+                return int(pytest.main(self._pytest_args(test_files)))
+            suite = unittest.defaultTestLoader.discover(self.workspace_path)
+            return 0 if unittest.TextTestRunner().run(suite).wasSuccessful() else 1
+        finally:
+            cov.stop()
+            cov.save()
+            os.environ.clear()
+            os.environ.update(original_environ)
+            sys.path[:] = original_path
+    
+    def _run_tests_in_subprocess(self, test_files: list[str], env: dict[str, str]) -> int:
+        """
+        Run the tests with coverage in a separate coverage process.
+
+        Args:
+            test_files: List[str], the list of test files to run
+            env: Dict[str, str], the environment built for the coverage run
+
+        Returns:
+            int: The exit code of the coverage process
+        """
+        cmd = self.build_coverage_command(test_files)
+        print(f"Command: {' '.join(cmd)}")
+        
+        # The test output goes straight to the job log instead of being buffered and decoded here
+        print("Test output:")
+        sys.stdout.flush()
+        # The runner is a throwaway environment, so inheriting file descriptors is harmless and
+        # skips closing every descriptor up to the nofile limit before exec
+        result = subprocess.run(cmd, cwd=self.workspace_path, env=env, close_fds=False)
+        return result.returncode
+    
+    def _build_coverage_env(self, config_dir: str, test_files: list[str]) -> dict[str, str]:
+        """
+        Build the environment for the coverage run so pytest-xdist workers are measured too.
+
+        Args:
+            config_dir: str, the directory to write the generated coverage configuration into
+            test_files: List[str], the list of test files to run
+
+        Returns:
+            Dict[str, str]: The environment to run the coverage command with
+        """
+        # Start from the project's own settings (branch, exclusions, plugins...) so the run measures what
+        # `coverage run` would, and only add what the parallel run itself needs
+        config = self._project_coverage_config()
+        run = config['run']
+        run['parallel'] = 'True'
+        # Every process writes next to the data file that combine and the report read
+        run['data_file'] = os.path.join(self.workspace_path, '.coverage')
+        # Coverage only accepts multiprocessing concurrency from a configuration file, so it lives here
+        # rather than on the command line; thread is kept unless the project uses a light-thread library
+        if not run.get('concurrency'):
+            run['concurrency'] = 'thread'
+        _extend_config_list(run, 'concurrency', 'multiprocessing')
+        # Like the --source/--omit flags of `coverage run`, the action's paths replace the project's
+        if self.source_paths:
+            run['source'] = '\n'.join(self.source_paths)
+        if self.exclude_paths:
+            run['omit'] = '\n'.join(self.exclude_paths)
+        # The controller process never runs measured code, so it always warns that it collected nothing
+        _extend_config_list(run, 'disable_warnings', 'no-data-collected')
+        if self.track_subprocesses:
+            _extend_config_list(run, 'patch', 'subprocess')
+        
+        rcfile = os.path.join(config_dir, 'coveragerc')
+        with open(rcfile, 'w') as f:
+            config.write(f)
+        
+        # Drop startup hooks inherited from the caller, they start a tracer in every process the tests spawn
+        env = os.environ.copy()
+        env.pop('COVERAGE_PROCESS_START', None)
+        env.pop('COVERAGE_PROCESS_CONFIG', None)
+        env['COVERAGE_RCFILE'] = rcfile
+        
+        # Workers are separate interpreters, coverage's startup hook only measures them when
+        # COVERAGE_PROCESS_START is set. The parent uses the same file so all data files combine.
+        if test_files or self.track_subprocesses:
+            env['COVERAGE_PROCESS_START'] = rcfile
+        # The worker plugin removes the hook again once a worker has started, it has to be importable there
+        if test_files and not self.track_subprocesses:
+            env['PYTHONPATH'] = os.pathsep.join(filter(None, (_PLUGIN_DIR, env.get('PYTHONPATH'))))
+        return env
+    
+    def _project_coverage_config(self) -> configparser.ConfigParser:
+        """
+        Read the project's coverage settings the way coverage.py finds them.
+
+        COVERAGE_RCFILE, .coveragerc, setup.cfg, tox.ini and pyproject.toml are all understood, because
+        coverage.py itself reads them; the result is written back in .coveragerc form.
+
+        Args:
+            None
+
+        Returns:
+            configparser.ConfigParser: The project's settings, with a [run] section present
+        """
+        # read_coverage_config, CONFIG_FILE_OPTIONS and plugin_options are coverage.py internals, not public API.
+        # requirements.txt keeps coverage below the next major version because of them.
+        # Unknown options are reported again by the coverage run itself, so they are not repeated here.
+        settings = coverage.config.read_coverage_config(config_file=True, warn=lambda message: None)
+        
+        config = configparser.ConfigParser(interpolation=None)
+        config['run'] = {}
+        for attr, where, *_ in settings.CONFIG_FILE_OPTIONS:
+            value = getattr(settings, attr, None)
+            if value is None:
+                continue
+            section, option = where.split(':')
+            if not config.has_section(section):
+                config.add_section(section)
+            config[section][option] = _config_value(value)
+        if settings.paths:
+            config['paths'] = {name: _config_value(paths) for name, paths in settings.paths.items()}
+        for plugin, options in settings.plugin_options.items():
+            config[plugin] = {option: _config_value(value) for option, value in options.items()}
+        return config
+    
+    def combine_coverage_data(self) -> None:
+        """
+        Combine the per-process coverage data files into a single .coverage file.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        cov = coverage.Coverage(data_file=os.path.join(self.workspace_path, '.coverage'))
+        try:
+            cov.combine()
+            cov.save()
+        except coverage.CoverageException as e:
+            print(f"Error: Error combining coverage data: {e}")
+    
     def generate_coverage_report(self) -> tuple[float, str]:
         """
         Generate and parse coverage report.
@@ -195,46 +761,27 @@ class CoverageChecker:
         """
         print("\nGenerating coverage report...")
         
-        # Generate JSON report for parsing
-        json_cmd = ['coverage', 'json', '-o', 'coverage.json']
-        try:
-            subprocess.run(json_cmd, check=True, cwd=self.workspace_path)
-        except subprocess.CalledProcessError as e:
-            print(f"Error: Error generating JSON report: {e}")
-            return 0.0, ""
-        
-        # Parse JSON report
-        coverage_file = os.path.join(self.workspace_path, 'coverage.json')
-        if not os.path.exists(coverage_file):
-            print("Error: Coverage JSON file not found")
-            return 0.0, ""
-            
+        # Load the data once and render every report in-process instead of starting a coverage CLI per report
+        cov = coverage.Coverage(data_file=os.path.join(self.workspace_path, '.coverage'))
+        report_buffer = io.StringIO()
         try:
-            with open(coverage_file, 'r') as f:
-                coverage_data = json.load(f)
-            
-            total_coverage = coverage_data.get('totals', {}).get('percent_covered', 0.0)
-            
-        except (json.JSONDecodeError, KeyError) as e:
-            print(f"Error: Error parsing coverage JSON: {e}")
+            cov.load()
+            total_coverage = cov.report(file=report_buffer, precision=2)
+        except coverage.CoverageException as e:
+            print(f"Error: Error generating coverage report: {e}")
             return 0.0, ""
         
-        # Generate human-readable report
-        report_cmd = ['coverage', 'report']
-        if self.report_format == 'html':
-            report_cmd = ['coverage', 'html', '-d', 'htmlcov']
-        elif self.report_format == 'xml':
-            report_cmd = ['coverage', 'xml', '-o', 'coverage.xml']
+        report_output = report_buffer.getvalue()
         
+        # Write the persistent report for the requested format
         try:
-            result = subprocess.run(
-                report_cmd,
-                capture_output=True,
-                text=True,
-                cwd=self.workspace_path
-            )
-            report_output = result.stdout
-        except subprocess.CalledProcessError:
+            if self.report_format == 'html':
+                cov.html_report(directory=os.path.join(self.workspace_path, 'htmlcov'))
+            elif self.report_format == 'xml':
+                cov.xml_report(outfile=os.path.join(self.workspace_path, 'coverage.xml'))
+            elif self.report_format == 'json':
+                cov.json_report(outfile=os.path.join(self.workspace_path, 'coverage.json'))
+        except (coverage.CoverageException, OSError):
             report_output = "Could not generate detailed report"
         
         return total_coverage, report_output
@@ -269,22 +816,55 @@ class CoverageChecker:
         Returns:
             None
         """
-        with open(github_output, 'a') as f:
-            f.write(f"coverage_percentage={coverage_percentage:.2f}\n")
-            f.write(f"tests_found={tests_found}\n")
-            
-            # Set report file path based on format
-            if self.report_format == 'html':
-                f.write(f"coverage_report=htmlcov/index.html\n")
-            elif self.report_format == 'xml':
-                f.write(f"coverage_report=coverage.xml\n")
-            elif self.report_format == 'json':
-                f.write(f"coverage_report=coverage.json\n")
-            else:
-                f.write(f"coverage_report=terminal_output\n")
+        lines = [
+            f"coverage_percentage={coverage_percentage:.2f}",
+            f"tests_found={tests_found}",
+            f"coverage_report={self._report_output_path()}"
+        ]
+        
+        # One write call for the whole payload instead of one per output
+        with open(github_output, 'a', buffering=1 << 16) as f:
+            f.write('\n'.join(lines) + '\n')
                 
         print("Success: GitHub Action outputs set")
     
+    def _report_output_path(self) -> str:
+        """
+        Get the report location for the coverage_report output.
+
+        Args:
+            None
+
+        Returns:
+            str: The path to the report file, or terminal_output for the terminal format
+        """
+        if self.report_format == 'html':
+            return 'htmlcov/index.html'
+        elif self.report_format == 'xml':
+            return 'coverage.xml'
+        elif self.report_format == 'json':
+            return 'coverage.json'
+        return 'terminal_output'
+    
+    def _can_skip_report(self) -> bool:
+        """
+        Check whether the coverage report can be skipped entirely.
+
+        A minimum coverage of 0 or less can never fail, so when only the terminal report is
+        requested and there are no GitHub outputs to set, nothing depends on the report.
+
+        Args:
+            None
+
+        Returns:
+            bool: True if report generation can be skipped
+        """
+        return (
+            self.minimum_coverage <= 0
+            and self.report_format == 'term'
+            and not os.environ.get('GITHUB_OUTPUT')
+        )
+    
     def run(self) -> int:
         """
         Main execution method.
@@ -319,6 +899,11 @@ class CoverageChecker:
             self.set_github_outputs(0.0, len(test_files))
             return 1
         
+        # Fast path: nothing depends on the report when the threshold can never fail
+        if self._can_skip_report():
+            print("\nSkipping coverage report: minimum coverage is 0% and no report was requested")
+            return 0
+        
         # Step 3: Generate coverage report
         coverage_percentage, report_output = self.generate_coverage_report()
         
@@ -344,6 +929,42 @@ class CoverageChecker:
         return 0
 
 
+# The command line interface, built once at import time
+_PARSER = argparse.ArgumentParser(description='Test Coverage Checker for GitHub Actions')
+
+_PARSER.add_argument('--minimum-coverage', 
+    default='80', 
+    help='Minimum coverage percentage required (0-100)')
+_PARSER.add_argument('--test-paths', 
+    default='tests/,test/,**/test_*.py,**/tests.py', 
+    help='Comma-separated list of test directories/files to include')
+_PARSER.add_argument('--source-paths', 
+    default='.', 
+    help='Comma-separated list of source directories to analyze')
+_PARSER.add_argument('--exclude-paths',  
+    default='tests/,test/,**/test_*.py,**/tests.py,setup.py,conftest.py',
+    help='Comma-separated list of paths to exclude from coverage')
+_PARSER.add_argument('--fail-on-low-coverage', 
+    default='true',
+    help='Whether to fail the action if coverage is below minimum')
+_PARSER.add_argument('--report-format', 
+    default='term',
+    choices=['term', 'html', 'xml', 'json'],
+    help='Coverage report format')
+_PARSER.add_argument('--track-subprocesses',
+    default='false',
+    help='Whether to measure coverage in subprocesses started by the tests')
+_PARSER.add_argument('--discovery-cache',
+    default='',
+    help='File used to cache test directory listings between runs (disabled when empty)')
+_PARSER.add_argument('--quiet',
+    default='false',
+    help='Whether to only print the number of discovered test files instead of listing them')
+_PARSER.add_argument('--subprocess',
+    default='false',
+    help='Whether to run the tests in a separate coverage process instead of in-process')
+
+
 def main() -> int:
     """
     Main entry point.
@@ -354,29 +975,7 @@ def main() -> int:
     Returns:
         int: The exit code
     """
-    parser = argparse.ArgumentParser(description='Test Coverage Checker for GitHub Actions')
-    
-    parser.add_argument('--minimum-coverage', 
-        default='80', 
-        help='Minimum coverage percentage required (0-100)')
-    parser.add_argument('--test-paths', 
-        default='tests/,test/,**/test_*.py,**/tests.py', 
-        help='Comma-separated list of test directories/files to include')
-    parser.add_argument('--source-paths', 
-        default='.', 
-        help='Comma-separated list of source directories to analyze')
-    parser.add_argument('--exclude-paths',  
-        default='tests/,test/,**/test_*.py,**/tests.py,setup.py,conftest.py',
-        help='Comma-separated list of paths to exclude from coverage')
-    parser.add_argument('--fail-on-low-coverage', 
-        default='true',
-        help='Whether to fail the action if coverage is below minimum')
-    parser.add_argument('--report-format', 
-        default='term',
-        choices=['term', 'html', 'xml', 'json'],
-        help='Coverage report format')
-    
-    args = parser.parse_args()
+    args = _PARSER.parse_args()
     
     checker = CoverageChecker(args)
     exit_code = checker.run()
@@ -384,5 +983,5 @@ def main() -> int:
     return exit_code
 
 
-if __name__ == '__main__':
+if __name__ == '__main__':  # pragma: no cover
     sys.exit(main())
@@ -0,0 +1,36 @@
+"""
+pytest plugin the coverage checker loads into its pytest-xdist workers
+"""
+
+import os
+import sys
+
+# The checker only puts this directory on the import path so the workers can import this plugin
+_PLUGIN_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def pytest_configure(config) -> None:
+    """
+    Keep coverage's startup hook to the pytest-xdist worker itself.
+
+    The worker is measured from its first line because COVERAGE_PROCESS_START was set when it
+    started. Removing it afterwards stops the processes the tests spawn from each starting a tracer.
+
+    Args:
+        config: pytest.Config, the configuration of the pytest process
+
+    Returns:
+        None
+    """
+    # Only workers have workerinput, the controlling process runs no tests
+    if not hasattr(config, 'workerinput'):
+        return
+    
+    os.environ.pop('COVERAGE_PROCESS_START', None)
+    paths = [path for path in os.environ.get('PYTHONPATH', '').split(os.pathsep) if path and path != _PLUGIN_DIR]
+    if paths:
+        os.environ['PYTHONPATH'] = os.pathsep.join(paths)
+    else:
+        os.environ.pop('PYTHONPATH', None)
+    # The plugin is already imported, the tests should not see its directory either
+    sys.path[:] = [path for path in sys.path if os.path.abspath(path) != _PLUGIN_DIR]
@@ -0,0 +1,42 @@
+"""
+Command line arguments and path helpers shared by the TestChecker.py tests
+"""
+
+import os
+from typing import NamedTuple
+
+# Relative paths already use forward slashes on POSIX, only Windows paths need converting
+_SEP_IS_SLASH = os.sep == '/'
+
+
+class Args(NamedTuple):
+    """
+    Stand-in for the argparse.Namespace built by main, CoverageChecker only reads its attributes.
+
+    Tests derive their arguments from BASE_ARGS with _replace instead of building a Namespace
+    field by field.
+    """
+    minimum_coverage: str = '80'
+    test_paths: str = 'tests/'
+    source_paths: str = '.'
+    exclude_paths: str = ''
+    fail_on_low_coverage: str = 'true'
+    report_format: str = 'term'
+    track_subprocesses: str = 'false'
+    discovery_cache: str = ''
+    quiet: str = 'false'
+    subprocess: str = 'false'
+
+
+BASE_ARGS = Args()
+
+
+def relative_paths(paths, root):
+    """Return the discovered paths relative to root, with '/' separators and root resolved only once."""
+    prefix = os.path.join(os.path.abspath(root), '')
+    
+    def _norm(path, _relpath=os.path.relpath):
+        relative = path[len(prefix):] if path.startswith(prefix) else _relpath(path, root)
+        return relative if _SEP_IS_SLASH else relative.replace(os.sep, '/')
+        
+    return frozenset(map(_norm, paths))
@@ -0,0 +1,64 @@
+"""
+Shared pytest fixtures for the TestChecker.py tests
+"""
+
+import functools
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+# Make TestChecker importable however pytest is started, the test modules repeat this for direct runs
+_ROOT = str(Path(__file__).resolve().parent.parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from TestChecker import CoverageChecker
+from tests._args import BASE_ARGS
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_checker(args):
+    """
+    Build one checker per distinct set of arguments, Args tuples are hashable.
+
+    The tests only call methods on a checker and never change its attributes, so it can be shared.
+    """
+    return CoverageChecker(args)
+
+
+@pytest.fixture(scope="module")
+def default_args():
+    """Default command line arguments, shared by every test."""
+    return BASE_ARGS
+
+
+@pytest.fixture(scope="module")
+def default_checker(default_args):
+    """Checker built from the default arguments, shared by every test in a module."""
+    return _cached_checker(default_args)
+
+
+@pytest.fixture(scope="module")
+def make_checker(default_args):
+    """Factory for checkers that need arguments other than the defaults."""
+    def _make_checker(**overrides):
+        return _cached_checker(default_args._replace(**overrides))
+    return _make_checker
+
+
+@pytest.fixture
+def mock_subprocess_run(monkeypatch):
+    """Replace subprocess.run with a mock for the duration of a test."""
+    mock_run = MagicMock()
+    monkeypatch.setattr('subprocess.run', mock_run)
+    return mock_run
+
+
+@pytest.fixture
+def mock_coverage(monkeypatch):
+    """Replace the coverage API used by TestChecker so no real data files are touched."""
+    mock_coverage_class = MagicMock()
+    monkeypatch.setattr('TestChecker.coverage.Coverage', mock_coverage_class)
+    return mock_coverage_class
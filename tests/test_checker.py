@@ -4,53 +4,93 @@ Tests for TestChecker.py
 """
 
 import unittest
+import io
 import os
 import sys
 import tempfile
-import shutil
-from unittest.mock import Mock, patch, mock_open
-from argparse import Namespace
-import subprocess
+from contextlib import ExitStack
+from unittest.mock import patch
+from pathlib import Path
 
-# Add the parent directory to the path so we can import TestChecker
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import coverage
+
+# Add the parent directory to the path so we can import TestChecker, once per process
+_PARENT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PARENT not in sys.path:
+    sys.path.insert(0, _PARENT)
 
 from TestChecker import CoverageChecker, main
+from tests._args import BASE_ARGS, relative_paths
+
+# Contents of a discovery cache file, read from memory instead of a mocked file object
+_FAKE_CACHE_JSON = '{"/repo/tests": [1, ["test_example.py"], []]}'
+
+
+def _open_factory(data):
+    """Return an open() replacement that hands out a fresh in-memory binary file holding data."""
+    return lambda *args, **kwargs: io.BytesIO(data.encode())
+
+
+class _FakeFile:
+    """Writable file stand-in that records every write in a plain list."""
+    
+    def __init__(self):
+        self.writes = []
+        
+    def write(self, text):
+        self.writes.append(text)
+        
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, *exc_info):
+        return None
+
+
+# Checker attributes expected from the TestCoverageChecker fixture arguments
+_EXPECTED_INIT = {
+    'minimum_coverage': 80.0,
+    'test_paths': ['tests/', '**/test_*.py'],
+    'source_paths': ['.'],
+    'exclude_paths': ['tests/', 'setup.py'],
+    'fail_on_low_coverage': True,
+    'report_format': 'term'
+}
+
+# Test files expected from the discovery tree, relative to its root
+_EXPECTED_ALL = frozenset({
+    'tests/test_example.py',
+    'tests/helper_test.py',
+    'src/test_from_src.py',
+    'other/tests.py'
+})
+# Only files matching the test_*.py pattern
+_EXPECTED_GLOB = frozenset({'tests/test_example.py', 'src/test_from_src.py'})
 
 
 class TestCoverageChecker(unittest.TestCase):
     """Test the CoverageChecker class."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.test_args = Namespace(
-            minimum_coverage='80',
-            test_paths='tests/,**/test_*.py',
-            source_paths='.',
-            exclude_paths='tests/,setup.py',
-            fail_on_low_coverage='true',
-            report_format='term'
-        )
-        self.checker = CoverageChecker(self.test_args)
+    @classmethod
+    def setUpClass(cls):
+        """Create the checker whose parsed arguments the tests compare, once for the whole class."""
+        cls.test_args = BASE_ARGS._replace(test_paths='tests/,**/test_*.py', exclude_paths='tests/,setup.py')
+        cls.checker = CoverageChecker(cls.test_args)
         
     def test_init_with_valid_args(self):
         """Test initialization with valid arguments."""
-        self.assertEqual(self.checker.minimum_coverage, 80.0)
-        self.assertEqual(self.checker.test_paths, ['tests/', '**/test_*.py'])
-        self.assertEqual(self.checker.source_paths, ['.'])
-        self.assertEqual(self.checker.exclude_paths, ['tests/', 'setup.py'])
-        self.assertTrue(self.checker.fail_on_low_coverage)
-        self.assertEqual(self.checker.report_format, 'term')
+        # One comparison of the whole snapshot reports every mismatching attribute at once
+        snapshot = {name: getattr(self.checker, name) for name in _EXPECTED_INIT}
+        self.assertEqual(snapshot, _EXPECTED_INIT)
         
     def test_init_with_false_fail_on_low_coverage(self):
         """Test initialization with fail_on_low_coverage set to false."""
-        args = Namespace(
+        args = BASE_ARGS._replace(
             minimum_coverage='70',
             test_paths='test/',
             source_paths='src/',
-            exclude_paths='',
             fail_on_low_coverage='false',
-            report_format='html'
+            report_format='html',
         )
         checker = CoverageChecker(args)
         
@@ -60,13 +100,12 @@ class TestCoverageChecker(unittest.TestCase):
         
     def test_init_handles_empty_paths(self):
         """Test initialization handles empty path strings correctly."""
-        args = Namespace(
+        args = BASE_ARGS._replace(
             minimum_coverage='90',
             test_paths='tests/, , **/test_*.py,',  # Empty spaces and trailing comma
             source_paths='., ,src/',  # Empty space
             exclude_paths='',  # Empty string
-            fail_on_low_coverage='true',
-            report_format='json'
+            report_format='json',
         )
         checker = CoverageChecker(args)
         
@@ -75,126 +114,135 @@ class TestCoverageChecker(unittest.TestCase):
         self.assertEqual(checker.source_paths, ['.', 'src/'])
         self.assertEqual(checker.exclude_paths, [])
 
+    def test_rel_strips_workspace_prefix(self):
+        """Test display paths are relative to the workspace."""
+        inside = os.path.join(self.checker.workspace_path, 'tests', 'test_example.py')
+        outside = os.path.join(os.path.dirname(self.checker.workspace_path), 'test_other.py')
+        
+        self.assertEqual(self.checker._rel(inside), 'tests/test_example.py')
+        self.assertEqual(self.checker._rel(outside), '../test_other.py')
+
 
 class TestFileDiscovery(unittest.TestCase):
     """Test file discovery methods."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create the temporary test file structure once for the whole class."""
+        # TemporaryDirectory with a class cleanup is removed even if the rest of setUpClass fails
+        temp_dir = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(temp_dir.cleanup)
+        cls.test_dir = temp_dir.name
+        
+        test_dir = Path(cls.test_dir)
+        for directory in ('tests', 'src', 'other', 'tests/__pycache__', 'node_modules', 'node_modules/pkg'):
+            (test_dir / directory).mkdir()
+        # Files in ignored directories such as node_modules are never discovered
+        for file_path in ('tests/test_example.py', 'tests/helper_test.py', 'src/test_from_src.py',
+                          'other/tests.py', 'not_a_test.py', 'tests/__pycache__/test_cached.py',
+                          'node_modules/pkg/test_vendored.py'):
+            (test_dir / file_path).touch()
+        
     def setUp(self):
-        """Set up test fixtures with a temporary directory."""
-        self.test_dir = tempfile.mkdtemp()
-        self.original_cwd = os.getcwd()
-        os.chdir(self.test_dir)
-        
-        # Create test file structure
-        os.makedirs('tests', exist_ok=True)
-        os.makedirs('src', exist_ok=True)
-        os.makedirs('other', exist_ok=True)
-        
-        # Create test files
-        open('tests/test_example.py', 'w').close()
-        open('tests/helper_test.py', 'w').close()
-        open('src/test_from_src.py', 'w').close()
-        open('other/tests.py', 'w').close()
-        open('not_a_test.py', 'w').close()
-        
-        self.test_args = Namespace(
-            minimum_coverage='80',
-            test_paths='tests/,**/test_*.py,**/tests.py',
-            source_paths='.',
-            exclude_paths='',
-            fail_on_low_coverage='true',
-            report_format='term'
-        )
+        """Set up test fixtures."""
+        self.test_args = BASE_ARGS._replace(test_paths='tests/,**/test_*.py,**/tests.py')
         self.checker = CoverageChecker(self.test_args)
         
-    def tearDown(self):
-        """Clean up test fixtures."""
-        os.chdir(self.original_cwd)
-        shutil.rmtree(self.test_dir)
-        
     def test_find_test_files_with_directory(self):
         """Test finding test files in a directory."""
-        test_files = self.checker.find_test_files()
+        test_files = self.checker.find_test_files(root=self.test_dir)
         
         # Should find test files in tests/ directory and matching patterns
-        expected_files = {
-            'tests/test_example.py',
-            'tests/helper_test.py', 
-            'src/test_from_src.py',
-            'other/tests.py'
-        }
-        
         # Normalize path separators for cross-platform compatibility
-        found_files = {os.path.relpath(f, self.test_dir).replace(os.sep, '/') for f in test_files}
-        self.assertEqual(found_files, expected_files)
+        found_files = relative_paths(test_files, self.test_dir)
+        self.assertEqual(found_files, _EXPECTED_ALL)
         
     def test_find_test_files_with_glob_pattern(self):
         """Test finding test files using glob patterns."""
-        args = Namespace(
-            minimum_coverage='80',
-            test_paths='**/test_*.py',  # Only glob pattern
-            source_paths='.',
-            exclude_paths='',
-            fail_on_low_coverage='true',
-            report_format='term'
-        )
+        args = BASE_ARGS._replace(test_paths='**/test_*.py')  # Only glob pattern
         checker = CoverageChecker(args)
         
-        test_files = checker.find_test_files()
+        test_files = checker.find_test_files(root=self.test_dir)
         
-        expected_files = {
-            'tests/test_example.py',
-            'src/test_from_src.py'  # Only files matching test_*.py pattern
-        }
-        found_files = {os.path.relpath(f, self.test_dir).replace(os.sep, '/') for f in test_files}
-        self.assertEqual(found_files, expected_files)
+        found_files = relative_paths(test_files, self.test_dir)
+        self.assertEqual(found_files, _EXPECTED_GLOB)
         
     def test_find_test_files_no_matches(self):
         """Test behavior when no test files are found."""
-        args = Namespace(
-            minimum_coverage='80',
-            test_paths='nonexistent/',
-            source_paths='.',
-            exclude_paths='',
-            fail_on_low_coverage='true',
-            report_format='term'
-        )
+        args = BASE_ARGS._replace(test_paths='nonexistent/')
         checker = CoverageChecker(args)
         
-        test_files = checker.find_test_files()
+        test_files = checker.find_test_files(root=self.test_dir)
         self.assertEqual(test_files, [])
         
     def test_find_test_files_specific_file(self):
         """Test finding a specific test file."""
-        args = Namespace(
-            minimum_coverage='80',
-            test_paths='tests/test_example.py',
-            source_paths='.',
-            exclude_paths='',
-            fail_on_low_coverage='true',
-            report_format='term'
-        )
+        args = BASE_ARGS._replace(test_paths='tests/test_example.py')
         checker = CoverageChecker(args)
         
-        test_files = checker.find_test_files()
+        test_files = checker.find_test_files(root=self.test_dir)
         self.assertEqual(len(test_files), 1)
         self.assertTrue(test_files[0].endswith('tests/test_example.py'))
 
+    def test_find_test_files_reuses_discovery_cache(self):
+        """Test unchanged directories are not scanned again when a discovery cache is used."""
+        args = self.test_args._replace(test_paths='tests/,other/', discovery_cache='.discovery-cache.json')
+        checker = CoverageChecker(args)
+        # The directory tree is shared by the whole class, so remove what this test adds to it
+        self.addCleanup(os.remove, os.path.join(self.test_dir, '.discovery-cache.json'))
+        self.addCleanup(os.remove, os.path.join(self.test_dir, 'tests', 'test_added.py'))
+        
+        first_run = checker.find_test_files(root=self.test_dir)
+        self.assertTrue(os.path.isfile(os.path.join(self.test_dir, '.discovery-cache.json')))
+        
+        with patch('os.scandir') as mock_scandir:
+            second_run = checker.find_test_files(root=self.test_dir)
+            
+        mock_scandir.assert_not_called()
+        self.assertEqual(sorted(second_run), sorted(first_run))
+        
+        # A new file changes the directory's mtime, so that directory is scanned again
+        Path(self.test_dir, 'tests', 'test_added.py').touch()
+        os.utime(os.path.join(self.test_dir, 'tests'), ns=(0, 0))
+        third_run = checker.find_test_files(root=self.test_dir)
+        self.assertIn(os.path.join(self.test_dir, 'tests', 'test_added.py'), third_run)
+        
+    def test_load_discovery_cache(self):
+        """Test the discovery cache is parsed, and ignored when it is not valid JSON or a listing is malformed."""
+        checker = CoverageChecker(self.test_args._replace(discovery_cache='.discovery-cache.json'))
+        
+        for contents, expected in ((_FAKE_CACHE_JSON, {'/repo/tests': [1, ['test_example.py'], []]}),
+                                   ('invalid json', {}), ('[]', {}), ('{"/repo/tests/": 5}', {}),
+                                   ('{"/repo/tests": [1, ["test_example.py"], []], "/repo/src": [1, "test_a.py", []],'
+                                    ' "/repo/lib": ["1", [], []], "/repo/other": [1, [2], []]}',
+                                    {'/repo/tests': [1, ['test_example.py'], []]})):
+            # Only TestChecker's open() lookups are redirected, not those of the test runner
+            with self.subTest(contents=contents), \
+                 patch('TestChecker.open', new=_open_factory(contents), create=True):
+                self.assertEqual(checker._load_discovery_cache(self.test_dir), expected)
+        
+    def test_find_test_files_listing(self):
+        """Test the discovered files are listed, or only counted in quiet mode."""
+        args = self.test_args._replace(test_paths='tests/')
+        
+        with patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+            CoverageChecker(args).find_test_files(root=self.test_dir)
+        self.assertIn("Found 2 test files:\n   • tests/helper_test.py\n   • tests/test_example.py\n", mock_stdout.getvalue())
+        
+        with patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+            CoverageChecker(args._replace(quiet='true')).find_test_files(root=self.test_dir)
+        self.assertIn("Found 2 test files\n", mock_stdout.getvalue())
+        self.assertNotIn("•", mock_stdout.getvalue())
+
 
 class TestCoverageCommands(unittest.TestCase):
     """Test coverage command building."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.test_args = Namespace(
-            minimum_coverage='80',
-            test_paths='tests/',
-            source_paths='src/',
-            exclude_paths='tests/,setup.py',
-            fail_on_low_coverage='true',
-            report_format='term'
-        )
-        self.checker = CoverageChecker(self.test_args)
+    @classmethod
+    def setUpClass(cls):
+        """Create the checker the command and environment tests build from, once for the whole class."""
+        cls.test_args = BASE_ARGS._replace(source_paths='src/', exclude_paths='tests/,setup.py')
+        cls.checker = CoverageChecker(cls.test_args)
         
     def test_build_coverage_command_with_test_files(self):
         """Test building coverage command when test files are provided."""
@@ -202,11 +250,12 @@ class TestCoverageCommands(unittest.TestCase):
         cmd = self.checker.build_coverage_command(test_files)
         
         expected_parts = [
-            'coverage', 'run',
+            self.checker._coverage_bin, 'run', '--parallel-mode',
             '--source=src/',
-            '--omit', 'tests/',
-            '--omit', 'setup.py',
+            '--omit=tests/,setup.py',
             '-m', 'pytest',
+            '-n', 'auto', '--dist=loadfile',
+            '-p', 'coverage_worker_plugin',
             'tests/test_example.py',
             'tests/test_helper.py'
         ]
@@ -219,10 +268,9 @@ class TestCoverageCommands(unittest.TestCase):
         cmd = self.checker.build_coverage_command(test_files)
         
         expected_parts = [
-            'coverage', 'run',
+            self.checker._coverage_bin, 'run', '--parallel-mode',
             '--source=src/',
-            '--omit', 'tests/',
-            '--omit', 'setup.py',
+            '--omit=tests/,setup.py',
             '-m', 'unittest', 'discover'
         ]
         
@@ -230,137 +278,229 @@ class TestCoverageCommands(unittest.TestCase):
         
     def test_build_coverage_command_current_directory_source(self):
         """Test building coverage command with current directory as source."""
-        args = Namespace(
-            minimum_coverage='80',
-            test_paths='tests/',
-            source_paths='.',
-            exclude_paths='',
-            fail_on_low_coverage='true',
-            report_format='term'
-        )
-        checker = CoverageChecker(args)
+        checker = CoverageChecker(BASE_ARGS)
         
         test_files = ['tests/test_example.py']
         cmd = checker.build_coverage_command(test_files)
         
         self.assertIn('--source=.', cmd)
 
+    def test_build_coverage_command_multiple_sources(self):
+        """Test that multiple source paths are passed as one comma-separated flag."""
+        checker = CoverageChecker(self.test_args._replace(source_paths='src/,lib/'))
+        
+        cmd = checker.build_coverage_command(['tests/test_example.py'])
+        
+        self.assertIn('--source=src/,lib/', cmd)
+        
+    @patch('shutil.which', return_value='/opt/venv/bin/coverage')
+    def test_build_coverage_command_resolved_executable(self, mock_which):
+        """Test that the coverage executable is resolved once and used in the command."""
+        checker = CoverageChecker(self.test_args)
+        
+        cmd = checker.build_coverage_command(['tests/test_example.py'])
+        
+        mock_which.assert_called_once_with('coverage')
+        self.assertEqual(cmd[0], '/opt/venv/bin/coverage')
+        self.assertEqual(len([part for part in cmd if part.startswith('--source')]), 1)
+
+    def test_build_coverage_env_points_workers_at_generated_config(self):
+        """Test the coverage environment lets pytest-xdist workers start coverage."""
+        with tempfile.TemporaryDirectory() as config_dir:
+            env = self.checker._build_coverage_env(config_dir, ['tests/test_example.py'])
+
+            self.assertEqual(env['COVERAGE_PROCESS_START'], env['COVERAGE_RCFILE'])
+            config = coverage.config.read_coverage_config(env['COVERAGE_PROCESS_START'], warn=self.fail)
+
+        self.assertTrue(config.parallel)
+        self.assertIn('multiprocessing', config.concurrency)
+        self.assertEqual(config.source, ['src/'])
+        self.assertEqual(config.run_omit, ['tests/', 'setup.py'])
+        self.assertEqual(config.data_file, os.path.join(self.checker.workspace_path, '.coverage'))
+        self.assertEqual(config.patch, [])
+        self.assertIn('no-data-collected', config.disable_warnings)
+
+    def test_build_coverage_env_keeps_project_settings(self):
+        """Test the generated config adds to the project's coverage settings instead of replacing them."""
+        with tempfile.TemporaryDirectory() as config_dir:
+            project_rcfile = os.path.join(config_dir, 'project.coveragerc')
+            with open(project_rcfile, 'w') as f:
+                f.write("[run]\nbranch = True\nconcurrency = gevent\n\n"
+                        "[report]\nexclude_also =\n    raise NotImplementedError\n")
+            with patch.dict(os.environ, {'COVERAGE_RCFILE': project_rcfile}):
+                env = self.checker._build_coverage_env(config_dir, ['tests/test_example.py'])
+            config = coverage.config.read_coverage_config(env['COVERAGE_RCFILE'], warn=self.fail)
+
+        self.assertTrue(config.branch)
+        self.assertEqual(config.concurrency, ['gevent', 'multiprocessing'])
+        self.assertEqual(config.exclude_also, ['raise NotImplementedError'])
+        self.assertTrue(config.parallel)
+
+    def test_build_coverage_env_makes_worker_plugin_importable(self):
+        """Test the workers can import the plugin that keeps the startup hook out of spawned processes."""
+        plugin_dir = os.path.join(os.path.dirname(os.path.abspath(sys.modules['TestChecker'].__file__)), '_plugins')
+        with tempfile.TemporaryDirectory() as config_dir:
+            env = self.checker._build_coverage_env(config_dir, ['tests/test_example.py'])
+
+        self.assertEqual(env['PYTHONPATH'].split(os.pathsep)[0], plugin_dir)
+        # Nothing but the plugin can be imported from that directory, so the project's imports are unaffected
+        self.assertEqual(set(os.listdir(plugin_dir)) - {'__pycache__'}, {'coverage_worker_plugin.py'})
+
+    @patch.dict(os.environ, {'COVERAGE_PROCESS_START': '/inherited/.coveragerc', 'COVERAGE_PROCESS_CONFIG': ':data:{}'})
+    def test_build_coverage_env_drops_inherited_startup_hooks(self):
+        """Test inherited subprocess hooks are dropped unless subprocess tracking is requested."""
+        with tempfile.TemporaryDirectory() as config_dir:
+            env = self.checker._build_coverage_env(config_dir, [])
+
+        self.assertNotIn('COVERAGE_PROCESS_START', env)
+        self.assertNotIn('COVERAGE_PROCESS_CONFIG', env)
+
+    def test_build_coverage_env_tracks_subprocesses(self):
+        """Test subprocess tracking patches subprocess start-up in the generated config."""
+        checker = CoverageChecker(self.test_args._replace(track_subprocesses='true'))
+
+        with tempfile.TemporaryDirectory() as config_dir:
+            env = checker._build_coverage_env(config_dir, [])
+            config = coverage.config.read_coverage_config(env['COVERAGE_PROCESS_START'], warn=self.fail)
+
+        self.assertEqual(config.patch, ['subprocess'])
+        # Spawned processes are measured, so the workers keep the startup hook for them
+        self.assertNotIn('coverage_worker_plugin', checker.build_coverage_command(['tests/test_example.py']))
+
 
 class TestCoverageReporting(unittest.TestCase):
     """Test coverage report generation."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.test_args = Namespace(
-            minimum_coverage='80',
-            test_paths='tests/',
-            source_paths='.',
-            exclude_paths='',
-            fail_on_low_coverage='true',
-            report_format='term'
-        )
-        self.checker = CoverageChecker(self.test_args)
-        
-    @patch('subprocess.run')
-    @patch('os.path.exists')
-    @patch('builtins.open', mock_open(read_data='{"totals": {"percent_covered": 85.5}}'))
-    def test_generate_coverage_report_success(self, mock_exists, mock_subprocess):
+    @classmethod
+    def setUpClass(cls):
+        """Create the default checker the reporting tests share."""
+        cls.test_args = BASE_ARGS
+        cls.checker = CoverageChecker(cls.test_args)
+        
+    @patch('TestChecker.coverage.Coverage')
+    def test_generate_coverage_report_success(self, mock_coverage):
         """Test successful coverage report generation."""
-        mock_exists.return_value = True
-        mock_subprocess.return_value = Mock(stdout="Coverage report", stderr="")
+        cov = mock_coverage.return_value
+        
+        def report(file, precision):
+            file.write("Coverage report")
+            return 85.5
+            
+        cov.report.side_effect = report
         
         coverage_percentage, report_output = self.checker.generate_coverage_report()
         
         self.assertEqual(coverage_percentage, 85.5)
         self.assertEqual(report_output, "Coverage report")
+        cov.load.assert_called_once()
+        # The terminal format does not write a report file
+        cov.json_report.assert_not_called()
+        
+    def test_generate_coverage_report_errors(self):
+        """Test coverage library errors are handled without failing the report step."""
+        checker = CoverageChecker(self.test_args._replace(report_format='json'))
+        cases = [
+            ('load', coverage.CoverageException("Couldn't use data file"), (0.0, "")),
+            ('report', coverage.exceptions.NoDataError("No data to report."), (0.0, "")),
+            ('json_report', coverage.CoverageException("No data to report."), (90.0, "Could not generate detailed report")),
+            ('json_report', FileNotFoundError("coverage.json"), (90.0, "Could not generate detailed report")),
+        ]
         
-    @patch('subprocess.run')
-    def test_generate_coverage_report_json_error(self, mock_subprocess):
-        """Test coverage report generation when JSON generation fails."""
-        mock_subprocess.side_effect = subprocess.CalledProcessError(1, 'coverage')
-        
-        coverage_percentage, report_output = self.checker.generate_coverage_report()
-        
-        self.assertEqual(coverage_percentage, 0.0)
-        self.assertEqual(report_output, "")
-        
-    @patch('subprocess.run')
-    @patch('os.path.exists')
-    def test_generate_coverage_report_missing_file(self, mock_exists, mock_subprocess):
-        """Test coverage report generation when JSON file is missing."""
-        mock_exists.return_value = False
-        mock_subprocess.return_value = Mock()
-        
-        coverage_percentage, report_output = self.checker.generate_coverage_report()
-        
-        self.assertEqual(coverage_percentage, 0.0)
-        self.assertEqual(report_output, "")
-        
-    @patch('subprocess.run')
-    @patch('os.path.exists')
-    @patch('builtins.open', mock_open(read_data='invalid json'))
-    def test_generate_coverage_report_invalid_json(self, mock_exists, mock_subprocess):
-        """Test coverage report generation with invalid JSON."""
-        mock_exists.return_value = True
-        mock_subprocess.return_value = Mock()
-        
-        coverage_percentage, report_output = self.checker.generate_coverage_report()
-        
-        self.assertEqual(coverage_percentage, 0.0)
+        for method, error, expected in cases:
+            with self.subTest(method=method, error=type(error).__name__), \
+                 patch('TestChecker.coverage.Coverage') as mock_coverage:
+                cov = mock_coverage.return_value
+                cov.report.return_value = 90.0
+                getattr(cov, method).side_effect = error
+                
+                self.assertEqual(checker.generate_coverage_report(), expected)
+        
+    @patch('TestChecker.coverage.Coverage')
+    def test_generate_coverage_report_json_format(self, mock_coverage):
+        """Test the JSON format writes coverage.json into the workspace."""
+        checker = CoverageChecker(self.test_args._replace(report_format='json'))
+        cov = mock_coverage.return_value
+        cov.report.return_value = 90.0
+        
+        coverage_percentage, _ = checker.generate_coverage_report()
+        
+        self.assertEqual(coverage_percentage, 90.0)
+        cov.json_report.assert_called_once_with(outfile=os.path.join(checker.workspace_path, 'coverage.json'))
+        
+    @patch('TestChecker.CoverageChecker.combine_coverage_data')
+    @patch('TestChecker.pytest.main')
+    @patch('TestChecker.coverage.Coverage')
+    def test_run_tests_in_process(self, mock_coverage, mock_pytest_main, mock_combine):
+        """Test that the tests run in-process while coverage is measuring."""
+        cov = mock_coverage.return_value
+        mock_pytest_main.side_effect = lambda args: os.environ['COVERAGE_PROCESS_START'] and 0
+        # Workers started by the action itself inherit its settings, so compare against what was there
+        inherited_rcfile = os.environ.get('COVERAGE_RCFILE')
+        
+        with patch('subprocess.run') as mock_subprocess:
+            success, output = self.checker.run_tests_with_coverage(['tests/test_example.py'])
+            
+        self.assertTrue(success)
+        mock_subprocess.assert_not_called()
+        mock_pytest_main.assert_called_once_with(
+            ['-n', 'auto', '--dist=loadfile', '-p', 'coverage_worker_plugin', 'tests/test_example.py']
+        )
+        # Data files of an earlier run are erased before the tests start
+        cov.erase.assert_called_once()
+        cov.start.assert_called_once()
+        cov.stop.assert_called_once()
+        cov.save.assert_called_once()
+        mock_combine.assert_called_once()
+        # The startup hook settings are only in place while the tests run
+        self.assertEqual(os.environ.get('COVERAGE_RCFILE'), inherited_rcfile)
+        
+    @patch('TestChecker.pytest.main', return_value=1)
+    @patch('TestChecker.coverage.Coverage')
+    def test_run_tests_in_process_failure(self, mock_coverage, mock_pytest_main):
+        """Test that failing in-process tests still save the coverage data."""
+        success, output = self.checker.run_tests_with_coverage(['tests/test_example.py'])
+        
+        self.assertFalse(success)
+        self.assertEqual(output, "Tests failed with return code 1")
+        mock_coverage.return_value.save.assert_called_once()
 
 
 class TestGitHubOutputs(unittest.TestCase):
     """Test GitHub Actions output handling."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.test_args = Namespace(
-            minimum_coverage='80',
-            test_paths='tests/',
-            source_paths='.',
-            exclude_paths='',
-            fail_on_low_coverage='true',
-            report_format='term'
-        )
-        self.checker = CoverageChecker(self.test_args)
+    @classmethod
+    def setUpClass(cls):
+        """Create the default checker the GitHub output tests share."""
+        cls.test_args = BASE_ARGS
+        cls.checker = CoverageChecker(cls.test_args)
         
     @patch.dict(os.environ, {'GITHUB_OUTPUT': '/tmp/github_output'})
-    @patch('builtins.open', mock_open())
     def test_set_github_outputs_terminal(self):
         """Test setting GitHub outputs for terminal format."""
-        with patch('builtins.open', mock_open()) as mock_file:
+        fake_file = _FakeFile()
+        with patch('builtins.open', return_value=fake_file) as mock_file:
             self.checker.set_github_outputs(85.5, 5)
             
-            mock_file.assert_called_once_with('/tmp/github_output', 'a')
-            handle = mock_file()
-            
-            expected_calls = [
-                unittest.mock.call.write('coverage_percentage=85.50\n'),
-                unittest.mock.call.write('tests_found=5\n'),
-                unittest.mock.call.write('coverage_report=terminal_output\n')
-            ]
-            
-            handle.write.assert_has_calls(expected_calls)
+        mock_file.assert_called_once_with('/tmp/github_output', 'a', buffering=1 << 16)
+        # All outputs are written in a single call
+        self.assertEqual(fake_file.writes, [
+            'coverage_percentage=85.50\n'
+            'tests_found=5\n'
+            'coverage_report=terminal_output\n'
+        ])
             
     @patch.dict(os.environ, {'GITHUB_OUTPUT': '/tmp/github_output'})
-    @patch('builtins.open', mock_open())
     def test_set_github_outputs_html(self):
         """Test setting GitHub outputs for HTML format."""
-        args = Namespace(
-            minimum_coverage='80',
-            test_paths='tests/',
-            source_paths='.',
-            exclude_paths='',
-            fail_on_low_coverage='true',
-            report_format='html'
-        )
+        args = BASE_ARGS._replace(report_format='html')
         checker = CoverageChecker(args)
         
-        with patch('builtins.open', mock_open()) as mock_file:
+        fake_file = _FakeFile()
+        with patch('builtins.open', return_value=fake_file):
             checker.set_github_outputs(90.0, 3)
             
-            handle = mock_file()
-            handle.write.assert_any_call('coverage_report=htmlcov/index.html\n')
+        self.assertEqual(len(fake_file.writes), 1)
+        self.assertIn('coverage_report=htmlcov/index.html\n', fake_file.writes[0])
             
     def test_set_github_outputs_no_env(self):
         """Test setting GitHub outputs when GITHUB_OUTPUT is not set."""
@@ -371,116 +511,51 @@ class TestGitHubOutputs(unittest.TestCase):
 class TestMainWorkflow(unittest.TestCase):
     """Test the main workflow and integration."""
     
-    @patch('TestChecker.CoverageChecker.find_test_files')
-    @patch('TestChecker.CoverageChecker.set_github_outputs')
-    def test_run_no_test_files_fail_on_low_coverage(self, mock_set_outputs, mock_find_files):
-        """Test run method when no test files found and fail_on_low_coverage is True."""
-        mock_find_files.return_value = []
-        
-        args = Namespace(
-            minimum_coverage='80',
-            test_paths='tests/',
-            source_paths='.',
-            exclude_paths='',
-            fail_on_low_coverage='true',
-            report_format='term'
-        )
-        checker = CoverageChecker(args)
-        
-        exit_code = checker.run()
-        
-        self.assertEqual(exit_code, 1)
-        mock_set_outputs.assert_called_once_with(0.0, 0)
-        
-    @patch('TestChecker.CoverageChecker.find_test_files')
-    @patch('TestChecker.CoverageChecker.set_github_outputs')
-    def test_run_no_test_files_continue_on_low_coverage(self, mock_set_outputs, mock_find_files):
-        """Test run method when no test files found and fail_on_low_coverage is False."""
-        mock_find_files.return_value = []
-        
-        args = Namespace(
-            minimum_coverage='80',
-            test_paths='tests/',
-            source_paths='.',
-            exclude_paths='',
-            fail_on_low_coverage='false',
-            report_format='term'
-        )
-        checker = CoverageChecker(args)
-        
-        exit_code = checker.run()
+    def setUp(self):
+        """Patch the workflow steps once for every test."""
+        stack = ExitStack()
+        self.addCleanup(stack.close)
+        self.mock_find_files = stack.enter_context(patch('TestChecker.CoverageChecker.find_test_files'))
+        self.mock_run_tests = stack.enter_context(patch('TestChecker.CoverageChecker.run_tests_with_coverage'))
+        self.mock_generate_report = stack.enter_context(patch('TestChecker.CoverageChecker.generate_coverage_report'))
+        self.mock_set_outputs = stack.enter_context(patch('TestChecker.CoverageChecker.set_github_outputs'))
+        
+    def test_run_table(self):
+        """Test the exit code and GitHub outputs of run for each workflow outcome."""
+        cases = [
+            # (test files, test run, coverage report, fail_on_low_coverage, exit code, outputs)
+            ([], None, None, 'true', 1, (0.0, 0)),
+            ([], None, None, 'false', 0, (0.0, 0)),
+            (['test_example.py'], (True, "Tests passed"), (85.0, "Coverage report"), 'true', 0, (85.0, 1)),
+            (['test_example.py'], (True, "Tests passed"), (60.0, "Coverage report"), 'true', 1, (60.0, 1)),
+            (['test_example.py'], (False, "Test execution failed"), None, 'true', 1, (0.0, 1)),
+        ]
         
-        self.assertEqual(exit_code, 0)
-        mock_set_outputs.assert_called_once_with(0.0, 0)
-        
-    @patch('TestChecker.CoverageChecker.find_test_files')
-    @patch('TestChecker.CoverageChecker.run_tests_with_coverage')
-    @patch('TestChecker.CoverageChecker.generate_coverage_report')
-    @patch('TestChecker.CoverageChecker.set_github_outputs')
-    def test_run_successful_coverage(self, mock_set_outputs, mock_generate_report, mock_run_tests, mock_find_files):
-        """Test successful run with coverage above threshold."""
-        mock_find_files.return_value = ['test_example.py']
-        mock_run_tests.return_value = (True, "Tests passed")
-        mock_generate_report.return_value = (85.0, "Coverage report")
-        
-        args = Namespace(
-            minimum_coverage='80',
-            test_paths='tests/',
-            source_paths='.',
-            exclude_paths='',
-            fail_on_low_coverage='true',
-            report_format='term'
-        )
+        for i, (test_files, run_result, report, fail_flag, expected_exit, expected_outputs) in enumerate(cases):
+            with self.subTest(case=i):
+                self.mock_find_files.return_value = test_files
+                self.mock_run_tests.return_value = run_result
+                self.mock_generate_report.return_value = report
+                self.mock_set_outputs.reset_mock()
+                
+                args = BASE_ARGS._replace(fail_on_low_coverage=fail_flag)
+                
+                self.assertEqual(CoverageChecker(args).run(), expected_exit)
+                self.mock_set_outputs.assert_called_once_with(*expected_outputs)
+        
+    @patch.dict(os.environ, {}, clear=True)
+    def test_run_zero_threshold_skips_report(self):
+        """Test that the report is skipped when the threshold is 0 and nothing needs it."""
+        self.mock_find_files.return_value = ['test_example.py']
+        self.mock_run_tests.return_value = (True, "Tests passed")
+        
+        args = BASE_ARGS._replace(minimum_coverage='0')
         checker = CoverageChecker(args)
         
         exit_code = checker.run()
         
         self.assertEqual(exit_code, 0)
-        mock_set_outputs.assert_called_once_with(85.0, 1)
-        
-    @patch('TestChecker.CoverageChecker.find_test_files')
-    @patch('TestChecker.CoverageChecker.run_tests_with_coverage')
-    @patch('TestChecker.CoverageChecker.generate_coverage_report')
-    def test_run_low_coverage_fail(self, mock_generate_report, mock_run_tests, mock_find_files):
-        """Test run with coverage below threshold and fail_on_low_coverage=True."""
-        mock_find_files.return_value = ['test_example.py']
-        mock_run_tests.return_value = (True, "Tests passed")
-        mock_generate_report.return_value = (60.0, "Coverage report")
-        
-        args = Namespace(
-            minimum_coverage='80',
-            test_paths='tests/',
-            source_paths='.',
-            exclude_paths='',
-            fail_on_low_coverage='true',
-            report_format='term'
-        )
-        checker = CoverageChecker(args)
-        
-        exit_code = checker.run()
-        
-        self.assertEqual(exit_code, 1)
-        
-    @patch('TestChecker.CoverageChecker.find_test_files')
-    @patch('TestChecker.CoverageChecker.run_tests_with_coverage')
-    def test_run_test_execution_failure(self, mock_run_tests, mock_find_files):
-        """Test run when test execution fails."""
-        mock_find_files.return_value = ['test_example.py']
-        mock_run_tests.return_value = (False, "Test execution failed")
-        
-        args = Namespace(
-            minimum_coverage='80',
-            test_paths='tests/',
-            source_paths='.',
-            exclude_paths='',
-            fail_on_low_coverage='true',
-            report_format='term'
-        )
-        checker = CoverageChecker(args)
-        
-        exit_code = checker.run()
-        
-        self.assertEqual(exit_code, 1)
+        self.mock_generate_report.assert_not_called()
 
 
 class TestMainFunction(unittest.TestCase):
@@ -509,6 +584,7 @@ class TestMainFunction(unittest.TestCase):
         mock_run.assert_called_once()
 
 
-if __name__ == '__main__':
-    # Set up test discovery and run tests
-    unittest.main(verbosity=2) 
\ No newline at end of file
+if __name__ == '__main__':  # pragma: no cover
+    # Run the tests through pytest
+    import pytest
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for _plugins/coverage_worker_plugin.py
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Add the plugin directory to the path so we can import coverage_worker_plugin, once per process
+_PLUGINS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '_plugins')
+if _PLUGINS not in sys.path:
+    sys.path.insert(0, _PLUGINS)
+
+import coverage_worker_plugin
+
+
+def test_worker_drops_startup_hook(monkeypatch):
+    """Test a pytest-xdist worker removes the startup hook and the plugin directory from its environment."""
+    monkeypatch.setenv('COVERAGE_PROCESS_START', '/tmp/coveragerc')
+    monkeypatch.setenv('PYTHONPATH', os.pathsep.join((coverage_worker_plugin._PLUGIN_DIR, '/project/src')))
+    monkeypatch.setattr(sys, 'path', ['/project', coverage_worker_plugin._PLUGIN_DIR, '/project/src'])
+    
+    coverage_worker_plugin.pytest_configure(SimpleNamespace(workerinput={}))
+    
+    assert 'COVERAGE_PROCESS_START' not in os.environ
+    assert os.environ['PYTHONPATH'] == '/project/src'
+    assert sys.path == ['/project', '/project/src']
+
+
+def test_worker_drops_pythonpath_it_added(monkeypatch):
+    """Test PYTHONPATH is removed when the plugin directory was its only entry."""
+    monkeypatch.setenv('PYTHONPATH', coverage_worker_plugin._PLUGIN_DIR)
+    
+    coverage_worker_plugin.pytest_configure(SimpleNamespace(workerinput={}))
+    
+    assert 'PYTHONPATH' not in os.environ
+
+
+def test_controller_keeps_startup_hook(monkeypatch):
+    """Test the controlling pytest process leaves the environment alone, its workers still need it."""
+    monkeypatch.setenv('COVERAGE_PROCESS_START', '/tmp/coveragerc')
+    
+    coverage_worker_plugin.pytest_configure(SimpleNamespace())
+    
+    assert os.environ['COVERAGE_PROCESS_START'] == '/tmp/coveragerc'
+
+
+if __name__ == '__main__':  # pragma: no cover
+    # Run the tests through pytest
+    sys.exit(pytest.main([__file__, '-q']))